@@ -1,6 +1,9 @@
 import json
+import heapq
 from queue import PriorityQueue
+from concurrent.futures import ProcessPoolExecutor
 import datetime
+import numpy as np
 from geopy import distance
 from timeit import default_timer as timer
 from abc import ABC, abstractmethod
@@ -58,6 +61,9 @@ class Problema:
         # Encontramos el estado final y el estado inicial en el diccionario de estados
         self.calcular_acciones()
         self.calcular_estados()
+        # Los problemas de la práctica 2 no tienen estado inicial ni final
+        if 'initial' not in self.data or 'final' not in self.data:
+            return
         self.estadoFinal = self.estados[self.data['final']]
         self.estadoInicial = self.estados[self.data['initial']]
         self.posicionFinal = (self.estadoFinal.latitud, self.estadoFinal.longitud)
@@ -92,6 +98,82 @@ class Problema:
         self.estados = {}
         for element in self.data['intersections']:
             self.estados[element['identifier']] = Estado(element['identifier'], element['longitude'], element['latitude'])
+
+    # Matriz de tiempos (en segundos) desde cada origen a cada destino, con un Dijkstra por origen.
+    # Las celdas sin camino valen np.inf. Con procesos > 1 los orígenes se reparten en un pool de procesos.
+    # Con caminos=True devuelve además, por cada celda, la lista de ids del camino (None si no hay camino).
+    def matriz_tiempos(self, origenes, destinos, procesos=1, caminos=False):
+        origenes = list(origenes)
+        destinos = list(destinos)
+        for identificador in origenes + destinos:
+            if identificador not in self.estados:
+                print(f"[ERROR] La intersección {identificador} no existe en el problema.")
+                return None
+        if procesos > 1 and len(origenes) > 1:
+            with ProcessPoolExecutor(max_workers=procesos, initializer=_iniciar_trabajador, initargs=(self.acciones,)) as pool:
+                trozo = max(1, len(origenes) // (procesos * 4))
+                filas = list(pool.map(_fila_trabajador, origenes, [destinos] * len(origenes), [caminos] * len(origenes), chunksize=trozo))
+        else:
+            filas = [fila_tiempos(self.acciones, origen, destinos, caminos) for origen in origenes]
+        matriz = np.array([fila[0] for fila in filas], dtype=float).reshape(len(origenes), len(destinos))
+        if caminos:
+            return matriz, [fila[1] for fila in filas]
+        return matriz
+
+    # Camino (lista de ids) y tiempo de un único par origen/destino, para reconstruir una celda concreta de la matriz
+    def camino(self, origen, destino):
+        tiempos, caminos = fila_tiempos(self.acciones, origen, [destino], True)
+        return caminos[0], tiempos[0]
+
+# Dijkstra desde origen que se detiene cuando todos los destinos están cerrados.
+# Devuelve los costes hasta los nodos alcanzados y el padre de cada uno.
+def dijkstra_uno_a_muchos(acciones, origen, destinos):
+    costes = {origen: 0}
+    padres = {origen: None}
+    pendientes = set(destinos)
+    cerrados = set()
+    frontera = [(0, origen)]
+    while frontera and pendientes:
+        coste, actual = heapq.heappop(frontera)
+        if actual in cerrados:
+            continue
+        cerrados.add(actual)
+        pendientes.discard(actual)
+        for accion in acciones.get(actual, ()):
+            nuevoCoste = coste + accion.coste
+            if nuevoCoste < costes.get(accion.destino, float('inf')):
+                costes[accion.destino] = nuevoCoste
+                padres[accion.destino] = actual
+                heapq.heappush(frontera, (nuevoCoste, accion.destino))
+    return costes, padres
+
+# Una fila de la matriz de tiempos: coste a cada destino y, si se piden, los caminos
+def fila_tiempos(acciones, origen, destinos, caminos=False):
+    costes, padres = dijkstra_uno_a_muchos(acciones, origen, destinos)
+    tiempos = [costes.get(destino, float('inf')) for destino in destinos]
+    if not caminos:
+        return tiempos, None
+    return tiempos, [reconstruirIds(padres, destino) for destino in destinos]
+
+def reconstruirIds(padres, destino):
+    if destino not in padres:
+        return None
+    ids = []
+    while destino is not None:
+        ids.append(destino)
+        destino = padres[destino]
+    ids.reverse()
+    return ids
+
+# Cada proceso del pool recibe las acciones una sola vez al arrancar
+_accionesTrabajador = None
+
+def _iniciar_trabajador(acciones):
+    global _accionesTrabajador
+    _accionesTrabajador = acciones
+
+def _fila_trabajador(origen, destinos, caminos):
+    return fila_tiempos(_accionesTrabajador, origen, destinos, caminos)
     
 class Heuristica():
     def __init__(self, valor):